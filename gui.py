@@ -1,23 +1,69 @@
 import sys
 import numpy as np
 
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout, QFormLayout,
     QDoubleSpinBox, QLabel, QPushButton,
-    QTabWidget, QSizePolicy
+    QTabWidget, QSizePolicy, QProgressBar, QMessageBox, QComboBox
 )
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from matplotlib.figure import Figure
 
 from pendulum import DoublePendulum
 from visualization import (
+    bob_positions,
     plot_theta1_vs_theta2,
     plot_phase_angles_vs_omega,
     plot_omega1_vs_omega2
 )
 
+# Методы интегрирования, доступные в GUI: подпись → значение method для DoublePendulum.integrate
+INTEGRATION_METHODS = (
+    ("RK4", "rk4"),
+    ("Средняя точка (симплектический)", "midpoint"),
+    ("DOP853 (адаптивный, SciPy)", "dop853"),
+    ("LSODA (адаптивный, SciPy)", "lsoda"),
+)
+
+# Максимальная частота кадров анимации. Точность расчёта задаёт dt,
+# а анимация показывает каждый stride-й шаг, чтобы таймер не превышал ~30 Гц.
+ANIMATION_FPS = 30.0
+
+
+class SimulationSignals(QObject):
+    """Сигналы фоновой симуляции (QRunnable не является QObject и не может иметь сигналов)."""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object, object)
+    error = pyqtSignal(str)
+
+
+class SimulationWorker(QRunnable):
+    """
+    Интегрирует уравнения маятника в пуле потоков Qt, не блокируя цикл событий GUI.
+    Результат (t, Y) передаётся в главный поток сигналом finished.
+    """
+
+    def __init__(self, pend: DoublePendulum, y0: np.ndarray, t_max: float, dt: float,
+                 method: str = "rk4"):
+        super().__init__()
+        self.pend = pend
+        self.y0 = y0
+        self.t_max = t_max
+        self.dt = dt
+        self.method = method
+        self.signals = SimulationSignals()
+
+    def run(self):
+        try:
+            t, Y = self.pend.integrate(y0=self.y0, t_max=self.t_max, dt=self.dt, method=self.method,
+                                       progress_cb=self.signals.progress.emit)
+        except Exception as exc:
+            self.signals.error.emit(str(exc))
+        else:
+            self.signals.finished.emit(t, Y)
+
 
 class PendulumWindow(QMainWindow):
     def __init__(self):
@@ -28,8 +74,15 @@ class PendulumWindow(QMainWindow):
         # Хранение данных после симуляции
         self.t = None
         self.Y = None
+        self.bobs = None
+        self._xbuf = None
+        self._ybuf = None
         self.ani = None
         self.paused = False
+        self._worker = None
+        self._sim_params = None
+        # Открытые окна фазовых портретов: при повторном нажатии фигура переиспользуется
+        self._phase_figs = {}
 
         # =======================
         # Виджеты ввода параметров
@@ -97,16 +150,30 @@ class PendulumWindow(QMainWindow):
         form_layout.addRow("t_max (с):", self.tmax_spin)
 
         self.dt_spin = QDoubleSpinBox()
+        self.dt_spin.setDecimals(3)
         self.dt_spin.setRange(0.001, 1.0)
         self.dt_spin.setSingleStep(0.01)
         self.dt_spin.setValue(0.03)
         form_layout.addRow("dt (с):", self.dt_spin)
 
+        # Метод интегрирования: у симплектического метода средней точки ошибка энергии
+        # не растёт со временем (но при малом dt она больше, чем у RK4),
+        # адаптивные методы SciPy сами подбирают шаг
+        self.method_combo = QComboBox()
+        for label, method in INTEGRATION_METHODS:
+            self.method_combo.addItem(label, method)
+        form_layout.addRow("Метод:", self.method_combo)
+
         # Кнопки управления
         self.run_button = QPushButton("Запустить симуляцию")
         self.run_button.clicked.connect(self.run_simulation)
         form_layout.addRow(self.run_button)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        form_layout.addRow(self.progress_bar)
+
         self.pause_button = QPushButton("Пауза")
         self.pause_button.setEnabled(False)
         self.pause_button.clicked.connect(self.toggle_pause)
@@ -129,7 +196,7 @@ class PendulumWindow(QMainWindow):
         anim_layout = QVBoxLayout()
 
         # FigureCanvas для анимации
-        self.canvas_anim = FigureCanvas(plt.Figure())
+        self.canvas_anim = FigureCanvas(Figure())
         self.canvas_anim.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         anim_layout.addWidget(self.canvas_anim)
         tab_anim.setLayout(anim_layout)
@@ -181,14 +248,44 @@ class PendulumWindow(QMainWindow):
         omega2_0 = float(self.omega2_spin.value())
         t_max = float(self.tmax_spin.value())
         dt = float(self.dt_spin.value())
+        method = self.method_combo.currentData()
 
-        # Создаём экземпляр модели и интегрируем
+        # Создаём экземпляр модели и запускаем интегрирование в фоновом потоке:
+        # окно остаётся отзывчивым, а анимация настраивается по сигналу finished
         pend = DoublePendulum(L1=L1, L2=L2, m1=m1, m2=m2)
         y0 = np.array([theta1_0, theta2_0, omega1_0, omega2_0], dtype=float)
-        t, Y = pend.integrate(y0=y0, t_max=t_max, dt=dt, method="rk4")
+        self._sim_params = (L1, L2, dt)
+
+        self.run_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+
+        self._worker = SimulationWorker(pend, y0, t_max, dt, method)
+        self._worker.signals.progress.connect(self.progress_bar.setValue)
+        self._worker.signals.finished.connect(self._on_simulation_finished)
+        self._worker.signals.error.connect(self._on_simulation_error)
+        QThreadPool.globalInstance().start(self._worker)
+
+    def _on_simulation_error(self, message: str):
+        self._worker = None
+        self.run_button.setEnabled(True)
+        QMessageBox.warning(self, "Ошибка симуляции", message)
+
+    def _on_simulation_finished(self, t: np.ndarray, Y: np.ndarray):
+        # Модуль анимации нужен только после запуска симуляции — импортируем лениво
+        import matplotlib.animation as animation
+
+        self._worker = None
+        self.run_button.setEnabled(True)
+        self.progress_bar.setValue(100)
+
+        L1, L2, dt = self._sim_params
         self.t = t
         self.Y = Y
 
+        # Координаты грузов [x1, y1, x2, y2] для всех кадров считаем один раз:
+        # animate_frame сводится к выборке строки, без тригонометрии
+        self.bobs = bob_positions(Y, L1, L2)
+
         # Включаем кнопки управления анимацией и сохранением
         self.pause_button.setEnabled(True)
         self.save_button.setEnabled(True)
@@ -196,6 +293,14 @@ class PendulumWindow(QMainWindow):
         self.plot_angles_vs_omega_btn.setEnabled(True)
         self.plot_omega1_omega2_btn.setEnabled(True)
 
+        # Останавливаем предыдущую анимацию: иначе её таймер продолжит
+        # перерисовывать ту же фигуру параллельно с новой
+        if self.ani is not None:
+            self.ani.event_source.stop()
+            self.ani = None
+        self.paused = False
+        self.pause_button.setText("Пауза")
+
         # Настраиваем анимацию на canvas_anim
         fig = self.canvas_anim.figure
         fig.clear()
@@ -207,26 +312,34 @@ class PendulumWindow(QMainWindow):
 
         line, = ax.plot([], [], 'o-', lw=2)
 
+        # Буферы координат [подвес, груз 1, груз 2]: подвес всегда в нуле,
+        # в кадре меняются только элементы 1 и 2, без создания списков и массивов
+        self._xbuf = np.zeros(3)
+        self._ybuf = np.zeros(3)
+
         def init():
             line.set_data([], [])
             return (line,)
 
         def animate_frame(i):
-            theta1_i = Y[i, 0]
-            theta2_i = Y[i, 1]
-            x1 = L1 * np.sin(theta1_i)
-            y1 = -L1 * np.cos(theta1_i)
-            x2 = x1 + L2 * np.sin(theta2_i)
-            y2 = y1 - L2 * np.cos(theta2_i)
-            line.set_data([0, x1, x2], [0, y1, y2])
+            bob = self.bobs[i]
+            self._xbuf[1] = bob[0]
+            self._xbuf[2] = bob[2]
+            self._ybuf[1] = bob[1]
+            self._ybuf[2] = bob[3]
+            line.set_data(self._xbuf, self._ybuf)
             return (line,)
 
+        # Шаг интегрирования и частота кадров независимы: при малом dt показываем
+        # каждый stride-й отсчёт, сохраняя реальный темп времени
+        stride = max(1, int(round(1.0 / ANIMATION_FPS / dt)))
+
         # Создаём FuncAnimation
         self.ani = animation.FuncAnimation(
             fig,
             animate_frame,
-            frames=len(t),
-            interval=int(1000 * dt),
+            frames=range(0, len(t), stride),
+            interval=int(1000 * dt * stride),
             blit=True,
             init_func=init
         )
@@ -261,7 +374,8 @@ class PendulumWindow(QMainWindow):
             return
         theta1 = self.Y[:, 0]
         theta2 = self.Y[:, 1]
-        plot_theta1_vs_theta2(theta1, theta2, save_as=None)
+        self._phase_figs["theta1_theta2"] = plot_theta1_vs_theta2(
+            theta1, theta2, save_as=None, fig=self._phase_figs.get("theta1_theta2"))
 
     def show_plot_angles_vs_omega(self):
         # Открываем окно с фазовым портретом θ vs ω
@@ -271,7 +385,8 @@ class PendulumWindow(QMainWindow):
         omega1 = self.Y[:, 2]
         theta2 = self.Y[:, 1]
         omega2 = self.Y[:, 3]
-        plot_phase_angles_vs_omega(theta1, omega1, theta2, omega2, save_as=None)
+        self._phase_figs["angles_vs_omega"] = plot_phase_angles_vs_omega(
+            theta1, omega1, theta2, omega2, save_as=None, fig=self._phase_figs.get("angles_vs_omega"))
 
     def show_plot_omega1_omega2(self):
         # Открываем окно с фазовым портретом ω₁ vs ω₂
@@ -279,7 +394,8 @@ class PendulumWindow(QMainWindow):
             return
         omega1 = self.Y[:, 2]
         omega2 = self.Y[:, 3]
-        plot_omega1_vs_omega2(omega1, omega2, save_as=None)
+        self._phase_figs["omega1_omega2"] = plot_omega1_vs_omega2(
+            omega1, omega2, save_as=None, fig=self._phase_figs.get("omega1_omega2"))
 
 
 if __name__ == "__main__":
@@ -4,12 +4,403 @@
 
 Класс реализует:
 - вычисление производных (θ₁, θ₂, ω₁, ω₂) по формулам Лагранжа;
-- интегрирование методом Рунге–Кутты 4-го порядка (RK4);
+- интегрирование методом Рунге–Кутты 4-го порядка (RK4)
+  или адаптивными методами SciPy (DOP853, LSODA с аналитическим якобианом);
+- симплектическое интегрирование неявным методом средней точки для длинных расчётов;
+- пакетное интегрирование серии начальных условий (integrate_batch);
 - опционально: сохранение результатов в файл.
+
+Горячий цикл RK4 вынесен в модульные функции, компилируемые Numba (@njit).
+Если Numba не установлена, те же функции выполняются как обычный Python-код.
+Если собрано Cython-расширение pendulum_core, integrate использует его.
 """
 
+from math import cos, inf, sin
+
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Заглушка для @njit: без Numba функции остаются обычными Python-функциями."""
+        def decorator(func):
+            return func
+        return decorator
+
+try:
+    # Необязательное Cython-расширение: python setup.py build_ext --inplace
+    import pendulum_core
+except ImportError:
+    pendulum_core = None
+
+
+# Добавка к знаменателю уравнений движения (защита от деления на ноль без ветвлений)
+_EPS = 1e-12
+
+# Относительный критерий остановки и предел числа итераций Ньютона в методе средней точки
+_MIDPOINT_TOL = 1e-13
+_MIDPOINT_MAX_ITER = 20
+
+# fastmath без флагов nnan/ninf: с ними LLVM считает inf/nan невозможными и выбрасывает
+# проверки на выход решения за пределы чисел с плавающей точкой в методе средней точки
+# и вызываемых им функциях (_derivs и _jacobian — через _hamilton_jacobian)
+_FINITE_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _derivs(theta1, theta2, omega1, omega2, L1, L2, m1, m2, g):
+    """
+    Правые части уравнений двойного маятника для скалярного состояния.
+
+    Возвращает кортеж (omega1, omega2, alpha1, alpha2) без создания массива.
+    """
+    Δ = theta1 - theta2
+
+    # Каждая тригонометрическая функция вычисляется ровно один раз
+    sin1 = sin(theta1)
+    sin2 = sin(theta2)
+    sinΔ = sin(Δ)
+    cosΔ = cos(Δ)
+    # denom_base ≥ m1 > 0, поэтому ветвление не нужно: _EPS лишь страхует от деления на ноль
+    denom_base = m1 + m2 * sinΔ * sinΔ + _EPS
+    denom1 = L1 * denom_base
+    denom2 = L2 * denom_base
+
+    # Вычисление α₁ по формулам Лагранжа
+    num1 = (m2 * g * sin2 * cosΔ
+            - m2 * sinΔ * (L1 * omega1 ** 2 * cosΔ + L2 * omega2 ** 2)
+            - (m1 + m2) * g * sin1)
+    alpha1 = num1 / denom1
+
+    # Вычисление α₂ по формулам Лагранжа
+    num2 = ((m1 + m2) * (L1 * omega1 ** 2 * sinΔ
+                         - g * sin2
+                         + g * sin1 * cosΔ)
+            + m2 * L2 * omega2 ** 2 * sinΔ * cosΔ)
+    alpha2 = num2 / denom2
+
+    return omega1, omega2, alpha1, alpha2
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rk4(S, start, stop, dt, L1, L2, m1, m2, g):
+    """
+    Выполняет шаги RK4 с номерами start..stop-1: по состоянию S[:, i] вычисляет S[:, i + 1].
+
+    S — буфер траектории размера (4, N), хранящийся построчно: каждая переменная
+    состояния непрерывна в памяти. Разбиение на отрезки [start, stop) позволяет
+    вызывающему коду сообщать о прогрессе; GIL на время расчёта освобождается.
+    Все стадии k1..k4 хранятся в скалярных локальных переменных,
+    поэтому внутри цикла не создаётся ни одного временного массива.
+    """
+    h = 0.5 * dt
+    for i in range(start, stop):
+        th1 = S[0, i]
+        th2 = S[1, i]
+        om1 = S[2, i]
+        om2 = S[3, i]
+
+        a1, a2, a3, a4 = _derivs(th1, th2, om1, om2, L1, L2, m1, m2, g)
+        b1, b2, b3, b4 = _derivs(th1 + h * a1, th2 + h * a2, om1 + h * a3, om2 + h * a4,
+                                 L1, L2, m1, m2, g)
+        c1, c2, c3, c4 = _derivs(th1 + h * b1, th2 + h * b2, om1 + h * b3, om2 + h * b4,
+                                 L1, L2, m1, m2, g)
+        d1, d2, d3, d4 = _derivs(th1 + dt * c1, th2 + dt * c2, om1 + dt * c3, om2 + dt * c4,
+                                 L1, L2, m1, m2, g)
+
+        s = dt / 6.0
+        S[0, i + 1] = th1 + s * (a1 + 2.0 * b1 + 2.0 * c1 + d1)
+        S[1, i + 1] = th2 + s * (a2 + 2.0 * b2 + 2.0 * c2 + d2)
+        S[2, i + 1] = om1 + s * (a3 + 2.0 * b3 + 2.0 * c3 + d3)
+        S[3, i + 1] = om2 + s * (a4 + 2.0 * b4 + 2.0 * c4 + d4)
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _jacobian(theta1, theta2, omega1, omega2, L1, L2, m1, m2, g):
+    """
+    Аналитическая матрица Якоби 4×4 правых частей _derivs по [θ1, θ2, ω1, ω2].
+
+    Используется неявными/жёсткими методами solve_ivp (LSODA).
+    """
+    Δ = theta1 - theta2
+    M = m1 + m2
+
+    sin1 = sin(theta1)
+    cos1 = cos(theta1)
+    sin2 = sin(theta2)
+    cos2 = cos(theta2)
+    sinΔ = sin(Δ)
+    cosΔ = cos(Δ)
+    cos2Δ = cosΔ * cosΔ - sinΔ * sinΔ
+    denom_base = m1 + m2 * sinΔ * sinΔ + _EPS
+    dbase = 2.0 * m2 * sinΔ * cosΔ  # ∂(denom_base)/∂Δ
+
+    _, _, alpha1, alpha2 = _derivs(theta1, theta2, omega1, omega2, L1, L2, m1, m2, g)
+
+    # Производные числителей по Δ при фиксированных sin(θ1), sin(θ2)
+    dnum1 = -m2 * g * sin2 * sinΔ - m2 * (L1 * omega1 ** 2 * cos2Δ + L2 * omega2 ** 2 * cosΔ)
+    dnum2 = M * (L1 * omega1 ** 2 * cosΔ - g * sin1 * sinΔ) + m2 * L2 * omega2 ** 2 * cos2Δ
+
+    # α = num / (L·base)  ⇒  ∂α = (∂num / L − α·∂base) / base
+    J = np.zeros((4, 4))
+    J[0, 2] = 1.0
+    J[1, 3] = 1.0
+    J[2, 0] = ((dnum1 - M * g * cos1) / L1 - alpha1 * dbase) / denom_base
+    J[2, 1] = ((-dnum1 + m2 * g * cos2 * cosΔ) / L1 + alpha1 * dbase) / denom_base
+    J[2, 2] = -2.0 * m2 * sinΔ * cosΔ * omega1 / denom_base
+    J[2, 3] = -2.0 * m2 * sinΔ * L2 * omega2 / (L1 * denom_base)
+    J[3, 0] = ((dnum2 + M * g * cos1 * cosΔ) / L2 - alpha2 * dbase) / denom_base
+    J[3, 1] = ((-dnum2 - M * g * cos2) / L2 + alpha2 * dbase) / denom_base
+    J[3, 2] = 2.0 * M * L1 * omega1 * sinΔ / (L2 * denom_base)
+    J[3, 3] = 2.0 * m2 * omega2 * sinΔ * cosΔ / denom_base
+    return J
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _momenta(theta1, theta2, omega1, omega2, L1, L2, m1, m2):
+    """Канонические импульсы (p1, p2) по углам и угловым скоростям."""
+    cosΔ = cos(theta1 - theta2)
+    p1 = (m1 + m2) * L1 * L1 * omega1 + m2 * L1 * L2 * omega2 * cosΔ
+    p2 = m2 * L2 * L2 * omega2 + m2 * L1 * L2 * omega1 * cosΔ
+    return p1, p2
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _hamilton_rhs(theta1, theta2, p1, p2, L1, L2, m1, m2, g):
+    """
+    Уравнения Гамильтона в канонических координатах (θ1, θ2, p1, p2).
+
+    Возвращает кортеж (dθ1/dt, dθ2/dt, dp1/dt, dp2/dt); первые два — угловые скорости ω1, ω2.
+    """
+    Δ = theta1 - theta2
+    sinΔ = sin(Δ)
+    cosΔ = cos(Δ)
+    denom_base = m1 + m2 * sinΔ * sinΔ + _EPS
+
+    omega1 = (L2 * p1 - L1 * p2 * cosΔ) / (L1 * L1 * L2 * denom_base)
+    omega2 = ((m1 + m2) * L1 * p2 - m2 * L2 * p1 * cosΔ) / (m2 * L1 * L2 * L2 * denom_base)
+
+    # ∂H/∂Δ = C1 − C2 (производная кинетической энергии по Δ при фиксированных импульсах)
+    C1 = p1 * p2 * sinΔ / (L1 * L2 * denom_base)
+    C2 = ((m2 * L2 * L2 * p1 * p1 + (m1 + m2) * L1 * L1 * p2 * p2
+           - 2.0 * m2 * L1 * L2 * p1 * p2 * cosΔ) * 2.0 * sinΔ * cosΔ
+          / (2.0 * L1 * L1 * L2 * L2 * denom_base * denom_base))
+
+    dp1 = -(m1 + m2) * g * L1 * sin(theta1) - C1 + C2
+    dp2 = -m2 * g * L2 * sin(theta2) + C1 - C2
+    return omega1, omega2, dp1, dp2
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _hamilton_jacobian(theta1, theta2, p1, p2, L1, L2, m1, m2, g):
+    """
+    Аналитическая матрица Якоби 4×4 правых частей _hamilton_rhs по [θ1, θ2, p1, p2].
+
+    Получается из _jacobian (переменные x = (θ, ω)) по правилу дифференцирования сложной
+    функции: z = Φ(x) = (θ, M(θ)·ω), ż = DΦ(x)·ẋ, поэтому ∂ż/∂z = ∂(DΦ·ẋ)/∂x · DΦ⁻¹.
+    Используется методом Ньютона в _midpoint.
+    """
+    omega1, omega2, _, _ = _hamilton_rhs(theta1, theta2, p1, p2, L1, L2, m1, m2, g)
+    _, _, alpha1, alpha2 = _derivs(theta1, theta2, omega1, omega2, L1, L2, m1, m2, g)
+    Jx = _jacobian(theta1, theta2, omega1, omega2, L1, L2, m1, m2, g)
+
+    sinΔ = sin(theta1 - theta2)
+    cosΔ = cos(theta1 - theta2)
+    # Матрица масс M(θ) = [[a, b·cosΔ], [b·cosΔ, d]] (p = M·ω) и обратная к ней;
+    # det M = b·L1·L2·denom_base — тот же знаменатель, что в _hamilton_rhs
+    a = (m1 + m2) * L1 * L1
+    b = m2 * L1 * L2
+    d = m2 * L2 * L2
+    c = b * cosΔ
+    det = b * L1 * L2 * (m1 + m2 * sinΔ * sinΔ + _EPS)
+    i11 = d / det
+    i12 = -c / det
+    i22 = a / det
+    # ∂p/∂θ1 при фиксированных ω (∂p/∂θ2 = −∂p/∂θ1)
+    q1 = -b * sinΔ * omega2
+    q2 = -b * sinΔ * omega1
+    # ∂ω/∂θ1 при фиксированных p: −M⁻¹·∂p/∂θ1
+    w1 = -(i11 * q1 + i12 * q2)
+    w2 = -(i12 * q1 + i22 * q2)
+
+    # dp/dt = M·α + (∂p/∂θ)·ω; K — её производные по x = (θ1, θ2, ω1, ω2)
+    u = omega1 - omega2
+    K = np.empty((2, 4))
+    for k in range(4):
+        K[0, k] = a * Jx[2, k] + c * Jx[3, k]
+        K[1, k] = c * Jx[2, k] + d * Jx[3, k]
+    e1 = -b * sinΔ * alpha2 - b * cosΔ * omega2 * u
+    e2 = -b * sinΔ * alpha1 - b * cosΔ * omega1 * u
+    K[0, 0] += e1
+    K[0, 1] -= e1
+    K[1, 0] += e2
+    K[1, 1] -= e2
+    K[0, 2] -= b * sinΔ * omega2
+    K[0, 3] -= b * sinΔ * (omega1 - 2.0 * omega2)
+    K[1, 2] -= b * sinΔ * (2.0 * omega1 - omega2)
+    K[1, 3] += b * sinΔ * omega1
+
+    # Умножение на DΦ⁻¹ = [[I, 0], [−M⁻¹·∂p/∂θ, M⁻¹]]
+    J = np.empty((4, 4))
+    J[0, 0] = w1
+    J[0, 1] = -w1
+    J[0, 2] = i11
+    J[0, 3] = i12
+    J[1, 0] = w2
+    J[1, 1] = -w2
+    J[1, 2] = i12
+    J[1, 3] = i22
+    for k in range(2):
+        t1 = K[k, 2] * w1 + K[k, 3] * w2
+        J[k + 2, 0] = K[k, 0] + t1
+        J[k + 2, 1] = K[k, 1] - t1
+        J[k + 2, 2] = K[k, 2] * i11 + K[k, 3] * i12
+        J[k + 2, 3] = K[k, 2] * i12 + K[k, 3] * i22
+    return J
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _finite4(v):
+    """Проверяет, что все четыре компоненты вектора v конечны (не inf и не nan)."""
+    return abs(v[0]) < inf and abs(v[1]) < inf and abs(v[2]) < inf and abs(v[3]) < inf
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH)
+def _solve4(A, b):
+    """
+    Решает систему A·x = b размера 4×4 методом Гаусса с выбором главного элемента
+    (на месте, решение записывается в b). Возвращает False, если матрица вырождена.
+    """
+    n = 4
+    for k in range(n):
+        p = k
+        for r in range(k + 1, n):
+            if abs(A[r, k]) > abs(A[p, k]):
+                p = r
+        if not abs(A[p, k]) > 0.0:
+            return False
+        if p != k:
+            for c in range(n):
+                A[k, c], A[p, c] = A[p, c], A[k, c]
+            b[k], b[p] = b[p], b[k]
+        for r in range(k + 1, n):
+            f = A[r, k] / A[k, k]
+            for c in range(k, n):
+                A[r, c] -= f * A[k, c]
+            b[r] -= f * b[k]
+    for k in range(n - 1, -1, -1):
+        acc = b[k]
+        for c in range(k + 1, n):
+            acc -= A[k, c] * b[c]
+        b[k] = acc / A[k, k]
+    return True
+
+
+@njit(cache=True, fastmath=_FINITE_FASTMATH, nogil=True)
+def _midpoint(S, start, stop, dt, L1, L2, m1, m2, g):
+    """
+    Выполняет шаги неявного метода средней точки с номерами start..stop-1.
+
+    Шаг делается в канонических координатах z = (θ1, θ2, p1, p2) по схеме
+    z⁺ = z + dt·F((z + z⁺)/2) с постоянным dt. Метод симплектический второго порядка:
+    ошибка энергии колеблется с размахом ~dt², но не накапливается со временем, как у RK4.
+    Неявное уравнение решается упрощённым методом Ньютона: якобиан _hamilton_jacobian
+    вычисляется один раз за шаг, итерации обычно сходятся за 2–3 шага.
+    Буфер S размера (4, N) и сигнатура те же, что у _rk4: в S хранятся (θ, ω).
+
+    Возвращает -1 при успехе или номер шага, на котором метод Ньютона не сошёлся
+    (шаг dt слишком велик для текущей скорости движения).
+    """
+    z = np.empty(4)
+    zn = np.empty(4)
+    mid = np.empty(4)
+    F = np.empty(4)
+    A0 = np.empty((4, 4))
+    A = np.empty((4, 4))
+    r = np.empty(4)
+
+    for i in range(start, stop):
+        z[0] = S[0, i]
+        z[1] = S[1, i]
+        z[2], z[3] = _momenta(S[0, i], S[1, i], S[2, i], S[3, i], L1, L2, m1, m2)
+
+        # Начальное приближение — явный метод средней точки (погрешность O(dt³))
+        F[0], F[1], F[2], F[3] = _hamilton_rhs(z[0], z[1], z[2], z[3], L1, L2, m1, m2, g)
+        for k in range(4):
+            mid[k] = z[k] + 0.5 * dt * F[k]
+        if not _finite4(mid):
+            return i
+        F[0], F[1], F[2], F[3] = _hamilton_rhs(mid[0], mid[1], mid[2], mid[3],
+                                               L1, L2, m1, m2, g)
+        for k in range(4):
+            zn[k] = z[k] + dt * F[k]
+        if not _finite4(zn):
+            return i
+
+        # Упрощённый метод Ньютона: матрица I − dt/2·∂F считается один раз за шаг
+        # в средней точке предиктора, её поправка за шаг — O(dt²)
+        for k in range(4):
+            mid[k] = 0.5 * (z[k] + zn[k])
+        J = _hamilton_jacobian(mid[0], mid[1], mid[2], mid[3], L1, L2, m1, m2, g)
+        for k in range(4):
+            for c in range(4):
+                A0[k, c] = -0.5 * dt * J[k, c]
+            A0[k, k] += 1.0
+
+        converged = False
+        for _ in range(_MIDPOINT_MAX_ITER):
+            for k in range(4):
+                mid[k] = 0.5 * (z[k] + zn[k])
+            F[0], F[1], F[2], F[3] = _hamilton_rhs(mid[0], mid[1], mid[2], mid[3],
+                                                   L1, L2, m1, m2, g)
+            # Невязка R = z⁺ − z − dt·F(mid); решаем (I − dt/2·∂F) δ = −R
+            for k in range(4):
+                r[k] = -(zn[k] - z[k] - dt * F[k])
+                for c in range(4):
+                    A[k, c] = A0[k, c]
+            if not _solve4(A, r):
+                break
+
+            change = 0.0
+            scale = 1.0
+            for k in range(4):
+                zn[k] += r[k]
+                change = max(change, abs(r[k]))
+                scale = max(scale, abs(zn[k]))
+            # Переполнение даёт inf/nan: sin/cos от них на следующей итерации недопустимы
+            if not _finite4(zn):
+                break
+            if change <= _MIDPOINT_TOL * scale:
+                converged = True
+                break
+
+        if not converged:
+            return i
+
+        w1, w2, _, _ = _hamilton_rhs(zn[0], zn[1], zn[2], zn[3], L1, L2, m1, m2, g)
+        S[0, i + 1] = zn[0]
+        S[1, i + 1] = zn[1]
+        S[2, i + 1] = w1
+        S[3, i + 1] = w2
+
+    return -1
+
+
+# Адаптивные методы scipy.integrate.solve_ivp: имя в integrate → имя в SciPy
+_SCIPY_METHODS = {"dop853": "DOP853", "lsoda": "LSODA"}
+
+
+if NUMBA_AVAILABLE:
+    # Прогревочный вызов: компиляция (или загрузка из кэша) основного метода RK4 происходит
+    # один раз при импорте, а не при первом нажатии «Запустить симуляцию». _midpoint и
+    # _jacobian нужны не при каждом запуске: они компилируются при первом вызове,
+    # в GUI — в фоновом потоке расчёта.
+    _rk4(np.zeros((4, 2)), 0, 1, 0.01, 1.0, 1.0, 1.0, 1.0, 9.81)
+
 
 class DoublePendulum:
     """
@@ -35,53 +426,64 @@ class DoublePendulum:
         self.m2 = float(m2)
         self.g = float(g)
 
-    def derivatives(self, state: np.ndarray) -> np.ndarray:
+    def derivatives(self, state: np.ndarray, out: np.ndarray = None) -> np.ndarray:
         """
         Вычисляет правые части дифференциальных уравнений двойного маятника.
 
         Параметры:
-            state (np.ndarray): вектор состояния [theta1, theta2, omega1, omega2],
-                                где theta — углы (рад), omega — угловые скорости (рад/с).
+            state (np.ndarray): вектор состояния [theta1, theta2, omega1, omega2] размера (4,)
+                                или пакет состояний размера (B, 4), где theta — углы (рад),
+                                omega — угловые скорости (рад/с).
+            out   (np.ndarray или None): заранее выделенный буфер той же формы, что и state.
+                                Если задан, результат записывается в него без новой аллокации.
 
         Возвращает:
-            dstate (np.ndarray): вектор производных [omega1, omega2, alpha1, alpha2].
+            dstate (np.ndarray): производные [omega1, omega2, alpha1, alpha2] той же формы,
+                                 что и state (тот же объект, что и out, если он передан).
         """
-        theta1, theta2, omega1, omega2 = state
+        state = np.asarray(state, dtype=float)
+        if out is None:
+            out = np.empty(state.shape, dtype=float)
+
+        if state.ndim == 1:
+            theta1, theta2, omega1, omega2 = state
+            out[:] = _derivs(theta1, theta2, omega1, omega2,
+                             self.L1, self.L2, self.m1, self.m2, self.g)
+            return out
+
+        # Пакет состояний: те же формулы, что и в _derivs, но поэлементно по всем B маятникам
+        theta1 = state[:, 0]
+        theta2 = state[:, 1]
+        omega1 = state[:, 2]
+        omega2 = state[:, 3]
         Δ = theta1 - theta2
 
+        sin1 = np.sin(theta1)
+        sin2 = np.sin(theta2)
         sinΔ = np.sin(Δ)
         cosΔ = np.cos(Δ)
-        denom1 = self.L1 * (self.m1 + self.m2 * sinΔ * sinΔ)
-        denom2 = self.L2 * (self.m1 + self.m2 * sinΔ * sinΔ)
-
-        # Предохраняемся от деления на ноль: если знаменатель слишком мал, добавляем eps
-        eps = 1e-8
-        if abs(denom1) < eps or abs(denom2) < eps:
-            # Вырожденное состояние (почти вертикально расположены оба звена)
-            # Возвращаем нулевые ускорения, чтобы интегратор не "взрывался"
-            alpha1 = 0.0
-            alpha2 = 0.0
-        else:
-            # Вычисление α₁ по формулам Лагранжа
-            num1 = (self.m2 * self.g * np.sin(theta2) * cosΔ
-                    - self.m2 * sinΔ * (self.L1 * omega1 ** 2 * cosΔ + self.L2 * omega2 ** 2)
-                    - (self.m1 + self.m2) * self.g * np.sin(theta1))
-            alpha1 = num1 / denom1
+        denom_base = self.m1 + self.m2 * sinΔ * sinΔ + _EPS
 
-            # Вычисление α₂ по формулам Лагранжа
-            num2 = ((self.m1 + self.m2) * (self.L1 * omega1 ** 2 * sinΔ
-                                           - self.g * np.sin(theta2)
-                                           + self.g * np.sin(theta1) * cosΔ)
-                    + self.m2 * self.L2 * omega2 ** 2 * sinΔ * cosΔ)
-            alpha2 = num2 / denom2
+        num1 = (self.m2 * self.g * sin2 * cosΔ
+                - self.m2 * sinΔ * (self.L1 * omega1 ** 2 * cosΔ + self.L2 * omega2 ** 2)
+                - (self.m1 + self.m2) * self.g * sin1)
+        num2 = ((self.m1 + self.m2) * (self.L1 * omega1 ** 2 * sinΔ
+                                       - self.g * sin2
+                                       + self.g * sin1 * cosΔ)
+                + self.m2 * self.L2 * omega2 ** 2 * sinΔ * cosΔ)
 
-        return np.array([omega1, omega2, alpha1, alpha2], dtype=float)
+        out[:, 0] = omega1
+        out[:, 1] = omega2
+        out[:, 2] = num1 / (self.L1 * denom_base)
+        out[:, 3] = num2 / (self.L2 * denom_base)
+        return out
 
     def integrate(self,
                   y0: np.ndarray,
                   t_max: float,
                   dt: float,
-                  method: str = "rk4") -> (np.ndarray, np.ndarray):
+                  method: str = "rk4",
+                  progress_cb=None) -> (np.ndarray, np.ndarray):
         """
         Интегрирует систему уравнений двойного маятника на отрезке времени [0, t_max] с шагом dt.
 
@@ -89,12 +491,24 @@ class DoublePendulum:
             y0      (np.ndarray): начальный вектор состояния [theta1_0, theta2_0, omega1_0, omega2_0].
             t_max   (float):       максимальное время моделирования (с).
             dt      (float):       шаг по времени (с).
-            method  (str):         метод интегрирования. Пока поддерживается только "rk4".
+            method  (str):         метод интегрирования:
+                                   "rk4"    — классический RK4 с фиксированным шагом dt;
+                                   "dop853" — адаптивный метод Дормана–Принса 8-го порядка (SciPy);
+                                   "lsoda"  — адаптивный LSODA (SciPy) с аналитическим якобианом;
+                                   "midpoint" — симплектический неявный метод средней точки
+                                                с фиксированным шагом dt: ошибка энергии
+                                                не дрейфует, но её размах ~dt² (больше, чем у RK4);
+                                                при несошедшемся шаге — RuntimeError.
+                                   Для адаптивных методов dt задаёт только сетку выходных точек.
+            progress_cb (callable или None): функция progress_cb(percent: int), вызываемая
+                                   примерно через каждый 1% шагов методов с фиксированным
+                                   шагом (для адаптивных — один раз по завершении).
 
         Возвращает:
             t (np.ndarray): массив времён от 0 до t_max с шагом dt, размер (N,).
             Y (np.ndarray): массив состояний размером (N, 4), где по столбцам:
-                            [theta1, theta2, omega1, omega2].
+                            [theta1, theta2, omega1, omega2]. Массив хранится в F-порядке:
+                            каждый столбец Y[:, k] непрерывен в памяти.
         """
         if dt <= 0:
             raise ValueError("Шаг dt должен быть положительным числом.")
@@ -103,37 +517,190 @@ class DoublePendulum:
         if y0.shape != (4,):
             raise ValueError("Начальный вектор y0 должен быть размерности (4,) — [θ1, θ2, ω1, ω2].")
 
+        dt = float(dt)
         t = np.arange(0.0, t_max + dt / 2, dt)  # Добавляем dt/2, чтобы включить t_max
         N = t.shape[0]
-        Y = np.zeros((N, 4), dtype=float)
-        Y[0, :] = y0
 
-        if method.lower() == "rk4":
-            for i in range(N - 1):
-                dt_i = dt
-                yi = Y[i, :]
+        if method.lower() in ("rk4", "midpoint"):
+            implicit = method.lower() == "midpoint"
+            if implicit:
+                step = _midpoint
+            else:
+                step = pendulum_core.rk4 if pendulum_core is not None else _rk4
+            # Траектория хранится построчно (4, N); наружу отдаём представление (N, 4)
+            S = np.empty((4, N), dtype=float)
+            S[:, 0] = y0
+            steps = N - 1
+            # Без обратного вызова — один проход, иначе отрезки по ~1% шагов
+            chunk = steps if progress_cb is None else steps // 100
+            chunk = max(chunk, 1)
+            for start in range(0, steps, chunk):
+                stop = min(start + chunk, steps)
+                failed = step(S, start, stop, dt, self.L1, self.L2, self.m1, self.m2, self.g)
+                # Результат есть только у _midpoint: -1 или номер шага, на котором
+                # уравнение шага не решилось; ядра RK4 ничего не возвращают
+                if implicit and failed >= 0:
+                    raise RuntimeError(f"Метод средней точки не сошёлся при t = {t[failed]:.3f} с. "
+                                       f"Уменьшите шаг dt.")
+                if progress_cb is not None:
+                    progress_cb(100 * stop // steps)
+            Y = S.T
+        elif method.lower() in _SCIPY_METHODS:
+            Y = self._integrate_scipy(np.asarray(y0, dtype=float), t, _SCIPY_METHODS[method.lower()])
+            if progress_cb is not None:
+                progress_cb(100)
+        else:
+            raise NotImplementedError(f"Метод интегрирования '{method}' не реализован. "
+                                      f"Доступны: 'rk4', 'midpoint', "
+                                      f"{', '.join(repr(m) for m in _SCIPY_METHODS)}.")
 
-                k1 = self.derivatives(yi)
-                k2 = self.derivatives(yi + 0.5 * dt_i * k1)
-                k3 = self.derivatives(yi + 0.5 * dt_i * k2)
-                k4 = self.derivatives(yi + dt_i * k3)
+        return t, Y
 
-                Y[i + 1, :] = yi + (dt_i / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
-        else:
-            raise NotImplementedError(f"Метод интегрирования '{method}' не реализован. Только 'rk4'.")
+    def energy(self, Y: np.ndarray) -> np.ndarray:
+        """
+        Вычисляет полную механическую энергию вдоль траектории (для контроля точности).
+
+        Параметры:
+            Y (np.ndarray): массив состояний (N, 4) — [θ1, θ2, ω1, ω2].
+
+        Возвращает:
+            E (np.ndarray): полная энергия T + V (Дж) на каждом шаге, размер (N,).
+        """
+        theta1, theta2, omega1, omega2 = Y[:, 0], Y[:, 1], Y[:, 2], Y[:, 3]
+        T = (0.5 * (self.m1 + self.m2) * self.L1 ** 2 * omega1 ** 2
+             + 0.5 * self.m2 * self.L2 ** 2 * omega2 ** 2
+             + self.m2 * self.L1 * self.L2 * omega1 * omega2 * np.cos(theta1 - theta2))
+        V = (-(self.m1 + self.m2) * self.g * self.L1 * np.cos(theta1)
+             - self.m2 * self.g * self.L2 * np.cos(theta2))
+        return T + V
+
+    def jacobian(self, state: np.ndarray) -> np.ndarray:
+        """
+        Вычисляет аналитическую матрицу Якоби правых частей.
+
+        Параметры:
+            state (np.ndarray): вектор состояния [theta1, theta2, omega1, omega2].
+
+        Возвращает:
+            J (np.ndarray): матрица 4×4, J[i, j] = ∂(dstate_i)/∂(state_j).
+        """
+        theta1, theta2, omega1, omega2 = state
+        return _jacobian(theta1, theta2, omega1, omega2,
+                         self.L1, self.L2, self.m1, self.m2, self.g)
+
+    def _integrate_scipy(self, y0: np.ndarray, t: np.ndarray, method: str) -> np.ndarray:
+        """
+        Интегрирует систему адаптивным методом scipy.integrate.solve_ivp.
+
+        Шаг подбирается решателем по допускам rtol/atol, а результат выдаётся
+        на равномерной сетке t (для анимации и графиков). Возвращает Y размера (N, 4).
+        """
+        from scipy.integrate import solve_ivp
+
+        params = (self.L1, self.L2, self.m1, self.m2, self.g)
+
+        def rhs(_t, y):
+            return _derivs(y[0], y[1], y[2], y[3], *params)
+
+        options = {}
+        if method == "LSODA":
+            # Якобиан нужен только неявным методам; явный DOP853 его не использует
+            options["jac"] = lambda _t, y: _jacobian(y[0], y[1], y[2], y[3], *params)
+
+        sol = solve_ivp(rhs, (0.0, t[-1]), y0, method=method, t_eval=t,
+                        rtol=1e-9, atol=1e-12, **options)
+        if not sol.success:
+            raise RuntimeError(f"Интегрирование методом {method} не удалось: {sol.message}")
+
+        # Приводим к той же раскладке, что и у RK4: столбцы Y[:, k] непрерывны в памяти
+        return np.asfortranarray(sol.y.T)
+
+    def integrate_batch(self,
+                        y0_batch: np.ndarray,
+                        t_max: float,
+                        dt: float) -> (np.ndarray, np.ndarray):
+        """
+        Интегрирует методом RK4 сразу B траекторий с разными начальными условиями
+        (например, для серии расчётов или оценки расхождения близких траекторий).
+
+        Все B маятников продвигаются одним векторным шагом, поэтому накладные расходы
+        интерпретатора делятся на всю серию.
+
+        Параметры:
+            y0_batch (np.ndarray): начальные состояния размера (B, 4) — [θ1, θ2, ω1, ω2].
+            t_max    (float):       максимальное время моделирования (с).
+            dt       (float):       шаг по времени (с).
+
+        Возвращает:
+            t (np.ndarray): массив времён от 0 до t_max с шагом dt, размер (N,).
+            Y (np.ndarray): массив состояний размером (N, B, 4).
+        """
+        if dt <= 0:
+            raise ValueError("Шаг dt должен быть положительным числом.")
+        if t_max <= 0:
+            raise ValueError("t_max должно быть положительным числом.")
+        y0_batch = np.asarray(y0_batch, dtype=float)
+        if y0_batch.ndim != 2 or y0_batch.shape[1] != 4:
+            raise ValueError("Массив y0_batch должен иметь форму (B, 4) — [θ1, θ2, ω1, ω2].")
+
+        t = np.arange(0.0, t_max + dt / 2, dt)  # Добавляем dt/2, чтобы включить t_max
+        N = t.shape[0]
+        Y = np.empty((N,) + y0_batch.shape, dtype=float)
+        Y[0] = y0_batch
+
+        # Буферы стадий выделяются один раз: каждая стадия пишется через out=,
+        # без временных массивов вида yi + 0.5 * dt * k на каждом шаге
+        k1 = np.empty_like(y0_batch)
+        k2 = np.empty_like(y0_batch)
+        k3 = np.empty_like(y0_batch)
+        k4 = np.empty_like(y0_batch)
+        y_tmp = np.empty_like(y0_batch)
+        h = 0.5 * dt
+
+        for i in range(N - 1):
+            yi = Y[i]
+
+            self.derivatives(yi, out=k1)
+            np.multiply(k1, h, out=y_tmp)
+            y_tmp += yi
+            self.derivatives(y_tmp, out=k2)
+            np.multiply(k2, h, out=y_tmp)
+            y_tmp += yi
+            self.derivatives(y_tmp, out=k3)
+            np.multiply(k3, dt, out=y_tmp)
+            y_tmp += yi
+            self.derivatives(y_tmp, out=k4)
+
+            # Y[i + 1] = yi + dt/6 · (k1 + 2·k2 + 2·k3 + k4), собираем прямо в строке Y
+            y_next = Y[i + 1]
+            np.add(k2, k3, out=y_next)
+            y_next *= 2.0
+            y_next += k1
+            y_next += k4
+            y_next *= dt / 6.0
+            y_next += yi
 
         return t, Y
 
-    def save_to_file(self, t: np.ndarray, Y: np.ndarray, filename: str = "pendulum_data.npz"):
+    def save_to_file(self, t: np.ndarray, Y: np.ndarray, filename: str = "pendulum_data.npz",
+                     compressed: bool = True, dtype=np.float32):
         """
         Сохраняет результаты моделирования в файл .npz.
 
+        По умолчанию данные записываются в float32 и сжимаются (np.savez_compressed):
+        файл получается в несколько раз меньше. float32 хранит ~7 значащих цифр — этого
+        достаточно для анимации и фазовых портретов, но не для продолжения расчёта
+        с сохранённого состояния; для полной точности передайте dtype=np.float64.
+
         Параметры:
             t (np.ndarray): одномерный массив времён.
             Y (np.ndarray): массив состояний (N, 4).
             filename (str): имя сохраняемого файла.
+            compressed (bool): сжимать ли файл (np.savez_compressed вместо np.savez).
+            dtype: тип чисел в файле (по умолчанию np.float32).
         """
-        np.savez(filename, t=t, Y=Y)
+        save = np.savez_compressed if compressed else np.savez
+        save(filename, t=t.astype(dtype, copy=False), Y=Y.astype(dtype, copy=False))
 
 
 if __name__ == "__main__":
@@ -150,3 +717,33 @@ if __name__ == "__main__":
     dt = 0.03
     t, Y = pend.integrate(y0=y0, t_max=t_max, dt=dt, method="rk4")
     print(f"Интегрирование завершено. Векторы t.shape = {t.shape}, Y.shape = {Y.shape}")
+
+    # Серия расчётов: пучок близких начальных условий интегрируется одним векторным проходом.
+    # Разброс θ₁ в конце показывает чувствительность к начальным условиям.
+    y0_batch = np.tile(y0, (10, 1))
+    y0_batch[:, 0] += np.linspace(0.0, 1e-6, 10)
+    t, Y_batch = pend.integrate_batch(y0_batch=y0_batch, t_max=t_max, dt=dt)
+    spread = np.ptp(Y_batch[-1, :, 0])
+    print(f"Серия из {Y_batch.shape[1]} траекторий: Y_batch.shape = {Y_batch.shape}, "
+          f"разброс θ₁ при t = {t[-1]:.2f} с: {spread:.3e} рад")
+
+    # Проверка метода средней точки. Порядок сходимости: при уменьшении dt вдвое ошибка
+    # в момент t = 1 с относительно RK4 с шагом 1e-4 с должна падать в 4 раза.
+    _, Y_ref = pend.integrate(y0=y0, t_max=1.0, dt=1e-4, method="rk4")
+    errors = []
+    for dt_mid in (0.004, 0.002, 0.001):
+        _, Y_mid = pend.integrate(y0=y0, t_max=1.0, dt=dt_mid, method="midpoint")
+        errors.append(np.abs(Y_mid[-1] - Y_ref[-1]).max())
+    orders = np.log2(np.array(errors[:-1]) / np.array(errors[1:]))
+    print(f"Метод средней точки: ошибки {', '.join(f'{e:.2e}' for e in errors)}, "
+          f"порядок {', '.join(f'{q:.2f}' for q in orders)}")
+    assert np.all(np.abs(orders - 2.0) < 0.1), "метод средней точки не второго порядка"
+
+    # Ошибка энергии ограничена: на последней десятой части расчёта в 1000 с она
+    # не больше, чем на первой (у RK4 с тем же dt она за это время растёт в ~10 раз)
+    t, Y_mid = pend.integrate(y0=y0, t_max=1000.0, dt=0.01, method="midpoint")
+    dE = np.abs(pend.energy(Y_mid) - pend.energy(Y_mid[:1])[0])
+    tenth = dE.shape[0] // 10
+    print(f"Ошибка энергии (dt = 0.01 с): {dE[:tenth].max():.3f} Дж за первые 100 с, "
+          f"{dE[-tenth:].max():.3f} Дж за последние 100 с")
+    assert dE[-tenth:].max() <= 1.1 * dE[:tenth].max() < 3.0, "ошибка энергии растёт"
@@ -0,0 +1,80 @@
+# cython: language_level=3
+"""
+Cython-версия горячего цикла RK4 для двойного маятника.
+
+Необязательное расширение: если оно собрано командой
+
+    python setup.py build_ext --inplace
+
+DoublePendulum.integrate использует его вместо Numba/Python-реализации.
+Формулы совпадают с pendulum._derivs.
+"""
+
+cimport cython
+from libc.math cimport sin, cos
+
+# Должна совпадать с pendulum._EPS
+cdef double _EPS = 1e-12
+
+
+cdef inline double _denom_base(double sinΔ, double m1, double m2) noexcept nogil:
+    # m1 + m2·sin²Δ ≥ m1 > 0, поэтому ветвление не нужно
+    return m1 + m2 * sinΔ * sinΔ + _EPS
+
+
+@cython.cdivision(True)
+cdef void _derivs(double t1, double t2, double o1, double o2, double* out,
+                  double L1, double L2, double m1, double m2, double g) noexcept nogil:
+    cdef double Δ = t1 - t2
+    cdef double sin1 = sin(t1)
+    cdef double sin2 = sin(t2)
+    cdef double sinΔ = sin(Δ)
+    cdef double cosΔ = cos(Δ)
+    cdef double base = _denom_base(sinΔ, m1, m2)
+
+    out[0] = o1
+    out[1] = o2
+    out[2] = (m2 * g * sin2 * cosΔ
+              - m2 * sinΔ * (L1 * o1 * o1 * cosΔ + L2 * o2 * o2)
+              - (m1 + m2) * g * sin1) / (L1 * base)
+    out[3] = ((m1 + m2) * (L1 * o1 * o1 * sinΔ - g * sin2 + g * sin1 * cosΔ)
+              + m2 * L2 * o2 * o2 * sinΔ * cosΔ) / (L2 * base)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def rk4(double[:, ::1] S, Py_ssize_t start, Py_ssize_t stop, double dt,
+        double L1, double L2, double m1, double m2, double g):
+    """
+    Выполняет шаги RK4 с номерами start..stop-1: по состоянию S[:, i] вычисляет S[:, i + 1].
+
+    S — буфер траектории размера (4, N), хранящийся построчно. Внутренний цикл
+    выполняется без GIL. Сигнатура совпадает с pendulum._rk4.
+    """
+    cdef double k1[4]
+    cdef double k2[4]
+    cdef double k3[4]
+    cdef double k4[4]
+    cdef double h = 0.5 * dt
+    cdef double s = dt / 6.0
+    cdef Py_ssize_t i, j
+
+    # Проверки границ в цикле отключены, поэтому диапазон проверяется здесь
+    if S.shape[0] != 4:
+        raise ValueError(f"Буфер S должен иметь 4 строки, получено {S.shape[0]}")
+    if not 0 <= start <= stop < S.shape[1]:
+        raise ValueError(f"Недопустимый диапазон шагов [{start}, {stop}) "
+                         f"для буфера из {S.shape[1]} точек")
+
+    with nogil:
+        for i in range(start, stop):
+            _derivs(S[0, i], S[1, i], S[2, i], S[3, i], k1, L1, L2, m1, m2, g)
+            _derivs(S[0, i] + h * k1[0], S[1, i] + h * k1[1],
+                    S[2, i] + h * k1[2], S[3, i] + h * k1[3], k2, L1, L2, m1, m2, g)
+            _derivs(S[0, i] + h * k2[0], S[1, i] + h * k2[1],
+                    S[2, i] + h * k2[2], S[3, i] + h * k2[3], k3, L1, L2, m1, m2, g)
+            _derivs(S[0, i] + dt * k3[0], S[1, i] + dt * k3[1],
+                    S[2, i] + dt * k3[2], S[3, i] + dt * k3[3], k4, L1, L2, m1, m2, g)
+            for j in range(4):
+                S[j, i + 1] = S[j, i] + s * (k1[j] + 2.0 * k2[j] + 2.0 * k3[j] + k4[j])
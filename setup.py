@@ -0,0 +1,13 @@
+"""
+Сборка необязательного Cython-расширения pendulum_core (ускоренный интегратор RK4):
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="double-pendulum-simulator",
+    ext_modules=cythonize("pendulum_core.pyx"),
+)
@@ -1,6 +1,54 @@
+"""
+Функции построения анимации и фазовых портретов двойного маятника.
+
+matplotlib.pyplot и matplotlib.animation импортируются внутри функций:
+модуль можно импортировать (например, из GUI), не платя за загрузку pyplot,
+пока пользователь не откроет график.
+"""
+
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+
+
+def bob_positions(Y: np.ndarray, L1: float, L2: float) -> np.ndarray:
+    """
+    Вычисляет декартовы координаты обоих грузов для всех шагов траектории.
+
+    Параметры:
+        Y  (np.ndarray): массив состояний (N, 4) — [θ₁, θ₂, ω₁, ω₂].
+        L1 (float):      длина первого маятника.
+        L2 (float):      длина второго маятника.
+
+    Возвращает:
+        bobs (np.ndarray): массив (N, 4) со столбцами [x1, y1, x2, y2]. Строка bobs[i]
+                           содержит всё, что нужно для отрисовки кадра i.
+    """
+    bobs = np.empty((Y.shape[0], 4), dtype=float)
+    np.multiply(L1, np.sin(Y[:, 0]), out=bobs[:, 0])
+    np.multiply(-L1, np.cos(Y[:, 0]), out=bobs[:, 1])
+    bobs[:, 2] = bobs[:, 0] + L2 * np.sin(Y[:, 1])
+    bobs[:, 3] = bobs[:, 1] - L2 * np.cos(Y[:, 1])
+    return bobs
+
+
+def _prepare_figure(fig=None):
+    """
+    Возвращает фигуру pyplot для построения графика.
+
+    Если fig передана и её окно ещё открыто, фигура очищается и переиспользуется;
+    иначе создаётся новая. При закрытии окна фигура удаляется из реестра pyplot
+    (plt.close), поэтому повторные открытия графиков не накапливают память.
+    """
+    import matplotlib.pyplot as plt
+
+    if fig is not None and plt.fignum_exists(fig.number):
+        fig.clear()
+        # Перерисовка откладывается до возврата в цикл событий, когда график уже построен
+        fig.canvas.draw_idle()
+        return fig
+
+    fig = plt.figure()
+    fig.canvas.mpl_connect('close_event', lambda event: plt.close(event.canvas.figure))
+    return fig
 
 
 def animate_double_pendulum(t: np.ndarray,
@@ -24,10 +72,13 @@ def animate_double_pendulum(t: np.ndarray,
     Возвращает:
         ani (FuncAnimation): объект анимации. Его можно использовать для управления (pause, resume).
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+
     if Y.shape[1] < 2:
         raise ValueError("Массив Y должен иметь по крайней мере два столбца (θ₁ и θ₂).")
 
-    fig = plt.figure()
+    fig = _prepare_figure()
     ax = fig.add_subplot(111, aspect='equal', autoscale_on=False,
                          xlim=(-(L1 + L2) * 1.1, (L1 + L2) * 1.1),
                          ylim=(-(L1 + L2) * 1.1, (L1 + L2) * 1.1))
@@ -35,18 +86,23 @@ def animate_double_pendulum(t: np.ndarray,
 
     line, = ax.plot([], [], 'o-', lw=2)
 
+    # Координаты грузов для всех кадров считаем один раз: в кадре — только выборка строки
+    bobs = bob_positions(Y, L1, L2)
+
+    # Буферы координат [подвес, груз 1, груз 2], переиспользуемые во всех кадрах
+    xbuf = np.zeros(3)
+    ybuf = np.zeros(3)
+
     def init():
         line.set_data([], [])
         return (line,)
 
     def animate(i):
-        theta1_i = Y[i, 0]
-        theta2_i = Y[i, 1]
-        x1 = L1 * np.sin(theta1_i)
-        y1 = -L1 * np.cos(theta1_i)
-        x2 = x1 + L2 * np.sin(theta2_i)
-        y2 = y1 - L2 * np.cos(theta2_i)
-        line.set_data([0, x1, x2], [0, y1, y2])
+        xbuf[1] = bobs[i, 0]
+        xbuf[2] = bobs[i, 2]
+        ybuf[1] = bobs[i, 1]
+        ybuf[2] = bobs[i, 3]
+        line.set_data(xbuf, ybuf)
         return (line,)
 
     ani = animation.FuncAnimation(fig,
@@ -68,7 +124,8 @@ def plot_theta1_vs_theta2(theta1: np.ndarray,
                           theta2: np.ndarray,
                           cmap: str = 'plasma',
                           s: float = 3,
-                          save_as: str = None):
+                          save_as: str = None,
+                          fig=None):
     """
     Строит фазовый портрет θ₁ vs θ₂ с автоматическим подбором масштабов по данным.
 
@@ -76,13 +133,23 @@ def plot_theta1_vs_theta2(theta1: np.ndarray,
         theta1 (np.ndarray): массив углов первого маятника (размер N).
         theta2 (np.ndarray): массив углов второго маятника (размер N).
         cmap   (str):        имя colormap (по умолчанию 'plasma').
-        s      (float):      размер точек (по умолчанию 3).
+        s      (float):      толщина траектории в единицах размера точки scatter: линия
+                             имеет ширину √s пт, как диаметр такой точки (по умолчанию 3).
         save_as (str или None): если задано (например, "phase_theta1_theta2.png"), график будет сохранён.
+        fig    (Figure или None): фигура предыдущего вызова; если её окно открыто,
+                             она очищается и переиспользуется вместо создания новой.
+
+    Возвращает:
+        fig (Figure): фигура с графиком.
     """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
     if theta1.shape != theta2.shape:
         raise ValueError("Массивы theta1 и theta2 должны иметь одинаковую форму.")
 
-    fig, ax = plt.subplots()
+    fig = _prepare_figure(fig)
+    ax = fig.add_subplot(111)
     ax.set_xlabel("Угол первого маятника θ₁ (рад)")
     ax.set_ylabel("Угол второго маятника θ₂ (рад)")
 
@@ -95,22 +162,30 @@ def plot_theta1_vs_theta2(theta1: np.ndarray,
     ax.set_xlim(min_t1 - pad_t1, max_t1 + pad_t1)
     ax.set_ylim(min_t2 - pad_t2, max_t2 + pad_t2)
 
+    # Траектория — одна коллекция отрезков (один путь отрисовки вместо N точек),
+    # отрезок i окрашен по номеру шага интегрирования
     N = theta1.shape[0]
-    scatter = ax.scatter(theta1, theta2, c=np.arange(N), cmap=cmap, s=s)
-    fig.colorbar(scatter, label="Шаг интегрирования")
-    plt.title("Фазовый портрет: θ₁ vs θ₂")
+    points = np.stack([theta1, theta2], axis=1).reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    lc = LineCollection(segments, cmap=cmap, linewidths=np.sqrt(s))
+    lc.set_array(np.arange(N - 1))
+    ax.add_collection(lc)
+    fig.colorbar(lc, ax=ax, label="Шаг интегрирования")
+    ax.set_title("Фазовый портрет: θ₁ vs θ₂")
 
     if save_as:
         fig.savefig(save_as, dpi=200)
 
     plt.show()
+    return fig
 
 
 def plot_phase_angles_vs_omega(theta1: np.ndarray,
                                omega1: np.ndarray,
                                theta2: np.ndarray,
                                omega2: np.ndarray,
-                               save_as: str = None):
+                               save_as: str = None,
+                               fig=None):
     """
     Строит два фазовых портрета: (θ₁ vs ω₁) и (θ₂ vs ω₂) в одной фигуре.
 
@@ -120,11 +195,19 @@ def plot_phase_angles_vs_omega(theta1: np.ndarray,
         theta2 (np.ndarray): массив углов второго маятника (размер N).
         omega2 (np.ndarray): массив угловых скоростей второго маятника (размер N).
         save_as (str или None): если задано (например, "phase_angles_vs_omega.png"), график будет сохранён.
+        fig    (Figure или None): фигура предыдущего вызова; если её окно открыто,
+                             она очищается и переиспользуется вместо создания новой.
+
+    Возвращает:
+        fig (Figure): фигура с графиком.
     """
+    import matplotlib.pyplot as plt
+
     if not (theta1.shape == omega1.shape == theta2.shape == omega2.shape):
         raise ValueError("Все входные массивы должны иметь одинаковую форму.")
 
-    fig, ax = plt.subplots()
+    fig = _prepare_figure(fig)
+    ax = fig.add_subplot(111)
     ax.plot(theta1, omega1, label="Первый маятник")
     ax.plot(theta2, omega2, label="Второй маятник")
     ax.set_xlabel("Угол θ (рад)")
@@ -136,11 +219,13 @@ def plot_phase_angles_vs_omega(theta1: np.ndarray,
         fig.savefig(save_as, dpi=200)
 
     plt.show()
+    return fig
 
 
 def plot_omega1_vs_omega2(omega1: np.ndarray,
                           omega2: np.ndarray,
-                          save_as: str = None):
+                          save_as: str = None,
+                          fig=None):
     """
     Строит фазовый портрет скоростей: ω₁ vs ω₂.
 
@@ -148,11 +233,19 @@ def plot_omega1_vs_omega2(omega1: np.ndarray,
         omega1 (np.ndarray): массив угловых скоростей первого маятника (размер N).
         omega2 (np.ndarray): массив угловых скоростей второго маятника (размер N).
         save_as (str или None): если задано (например, "phase_omega1_omega2.png"), график будет сохранён.
+        fig    (Figure или None): фигура предыдущего вызова; если её окно открыто,
+                             она очищается и переиспользуется вместо создания новой.
+
+    Возвращает:
+        fig (Figure): фигура с графиком.
     """
+    import matplotlib.pyplot as plt
+
     if omega1.shape != omega2.shape:
         raise ValueError("Массивы omega1 и omega2 должны иметь одинаковую форму.")
 
-    fig, ax = plt.subplots()
+    fig = _prepare_figure(fig)
+    ax = fig.add_subplot(111)
     ax.plot(omega1, omega2)
     ax.set_xlabel("Угловая скорость первого маятника ω₁ (рад/с)")
     ax.set_ylabel("Угловая скорость второго маятника ω₂ (рад/с)")
@@ -162,3 +255,4 @@ def plot_omega1_vs_omega2(omega1: np.ndarray,
         fig.savefig(save_as, dpi=200)
 
     plt.show()
+    return fig